@@ -27,3 +27,4 @@ PARLAY_MAX_LEGS = int(_env_or_secret("PARLAY_MAX_LEGS", "4") or "4")
 KELLY_FRACTION = float(_env_or_secret("KELLY_FRACTION", "0.25") or "0.25")
 EDGE_A = float(_env_or_secret("EDGE_A_THRESHOLD", "2.5") or "2.5")
 EDGE_B = float(_env_or_secret("EDGE_B_THRESHOLD", "1.0") or "1.0")
+WORKERS = int(_env_or_secret("WORKERS", "1") or "1")
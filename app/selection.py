@@ -9,6 +9,40 @@ from pricing import (
     confidence_from_edge,
 )
 
+BASE_MARKETS = ("h2h", "spreads", "totals")
+
+# ---------- compact event form ----------
+#
+# The builders work on a packed copy of the event rather than the API dict
+# tree: (id, sport_key, commence_time, home_team, away_team, markets), where
+# markets maps market key -> [(book_key, [(name, price, point), ...]), ...] in
+# book order, holding only BASE_MARKETS and the requested prop keys. It is
+# what slate.py ships to worker processes, so it must stay marshal-able.
+# Builders may only read the fields kept here; anything else (an outcome's
+# "description", a book's "last_update", ...) has to be added to pack_event
+# first, or the multi-process path would disagree with the serial one.
+
+def pack_event(event: Dict[str, Any], prop_market_keys: List[str] | None = None) -> tuple:
+    keep = set(BASE_MARKETS)
+    keep.update(prop_market_keys or ())
+    markets: Dict[str, list] = {}
+    for bm in event.get("bookmakers", []):
+        book_key = bm.get("key")
+        for m in bm.get("markets", []):
+            mkey = m.get("key")
+            if mkey in keep:
+                markets.setdefault(mkey, []).append(
+                    (book_key, [(o.get("name"), o.get("price"), o.get("point")) for o in m.get("outcomes", [])])
+                )
+    return (
+        event.get("id"),
+        event.get("sport_key"),
+        event.get("commence_time"),
+        event.get("home_team"),
+        event.get("away_team"),
+        markets,
+    )
+
 # ---------- helpers ----------
 
 def _aliases(home: str, away: str) -> Dict[str, str]:
@@ -20,97 +54,91 @@ def _aliases(home: str, away: str) -> Dict[str, str]:
         away: away,
     }
 
-def _best_prices_two_way(bookmakers: List[Dict[str, Any]], allowed_books: List[str] | None = None) -> Dict[str, Dict[str, Any]]:
+def _best_prices_two_way(markets: Dict[str, list], allowed_books: List[str] | None = None) -> Dict[str, Dict[str, Any]]:
+    """Return best moneyline price per selection name."""
     best: Dict[str, Dict[str, Any]] = {}
-    for bm in bookmakers:
-        book_key = bm.get("key")
+    for book_key, outcomes in markets.get("h2h", ()):
         if allowed_books and book_key not in allowed_books:
             continue
-        for market in bm.get("markets", []):
-            if market.get("key") not in ("h2h", "spreads", "totals"):
+        for name, price, point in outcomes:
+            if name is None or price is None:
                 continue
-            for outcome in market.get("outcomes", []):
-                name = outcome.get("name")
-                price = outcome.get("price")
-                sel_key = f"{market.get('key')}::{name}"
-                if name is None or price is None:
-                    continue
-                if sel_key not in best or price > best[sel_key]["price"]:
-                    best[sel_key] = {"price": price, "book": book_key, "point": outcome.get("point")}
+            if name not in best or price > best[name]["price"]:
+                best[name] = {"price": price, "book": book_key, "point": point}
     return best
 
-def _collect_two_way_by_point(bookmakers, market_key, side_a, side_b):
+def _collect_two_way_by_point(markets, market_key, side_a, side_b):
     """Return dict: {point: (sum_raw_prob_a, sum_raw_prob_b, count)} across books."""
     buckets = {}
     alias = _aliases(side_a, side_b)
-    for bm in bookmakers:
-        for m in bm.get("markets", []):
-            if m.get("key") != market_key:
+    for _book_key, outcomes in markets.get(market_key, ()):
+        pts = {}
+        for name, price, pt in outcomes:
+            if name is None or pt is None or price is None:
                 continue
-            outs = m.get("outcomes", [])
-            pts = {}
-            for o in outs:
-                name = o.get("name")
-                pt = o.get("point")
-                price = o.get("price")
-                if name is None or pt is None or price is None:
-                    continue
-                # normalize side to team name when possible
-                norm = alias.get(name, name)
-                if norm in (side_a, side_b):
-                    pts.setdefault(pt, {})[norm] = price
-            for pt, d in pts.items():
-                if side_a in d and side_b in d:
-                    pa = american_to_prob(d[side_a])
-                    pb = american_to_prob(d[side_b])
-                    a, b, n = buckets.get(pt, (0.0, 0.0, 0))
-                    buckets[pt] = (a + pa, b + pb, n + 1)
+            # normalize side to team name when possible
+            norm = alias.get(name, name)
+            if norm in (side_a, side_b):
+                pts.setdefault(pt, {})[norm] = price
+        for pt, d in pts.items():
+            if side_a in d and side_b in d:
+                pa = american_to_prob(d[side_a])
+                pb = american_to_prob(d[side_b])
+                a, b, n = buckets.get(pt, (0.0, 0.0, 0))
+                buckets[pt] = (a + pa, b + pb, n + 1)
     return buckets
 
-def _best_prices_two_way_with_point(bookmakers, market_key, allowed_books=None, side_alias=None):
+def _best_prices_two_way_with_point(markets, market_key, allowed_books=None, side_alias=None):
     """Return best price per (selection, point). selection is canonical team or 'Over'/'Under'."""
     best = {}
-    for bm in bookmakers:
-        book_key = bm.get("key")
+    for book_key, outcomes in markets.get(market_key, ()):
         if allowed_books and book_key not in allowed_books:
             continue
-        for m in bm.get("markets", []):
-            if m.get("key") != market_key:
+        for name, price, pt in outcomes:
+            if name is None or pt is None or price is None:
                 continue
-            for o in m.get("outcomes", []):
-                name = o.get("name")
-                pt = o.get("point")
-                price = o.get("price")
-                if name is None or pt is None or price is None:
-                    continue
-                if side_alias:
-                    name = side_alias.get(name, name)
-                key = (name, float(pt))
-                if key not in best or price > best[key]["price"]:
-                    best[key] = {"price": price, "book": book_key, "point": float(pt)}
+            if side_alias:
+                name = side_alias.get(name, name)
+            key = (name, float(pt))
+            if key not in best or price > best[key]["price"]:
+                best[key] = {"price": price, "book": book_key, "point": float(pt)}
     return best
 
-# ---------- builders ----------
+def _two_way_fair_probs(markets, market_key, side_a, side_b):
+    raw_a, raw_b, n = 0.0, 0.0, 0
+    alias = _aliases(side_a, side_b)
+    for _book_key, outcomes in markets.get(market_key, ()):
+        prices = {}
+        for name, price, _pt in outcomes:
+            if name is None:
+                continue
+            prices[alias.get(name, name)] = price
+        if side_a in prices and side_b in prices:
+            raw_a += american_to_prob(prices[side_a])
+            raw_b += american_to_prob(prices[side_b])
+            n += 1
+    if n == 0:
+        return 0.0, 0.0
+    pa, pb = raw_a / n, raw_b / n
+    return no_vig_two_way(pa, pb)
 
-def build_straight_picks(event: Dict[str, Any], kelly_fraction: float, bankroll_units: float,
-                         edge_A: float, edge_B: float, price_books: List[str] | None = None) -> List[Dict[str, Any]]:
-    picks: List[Dict[str, Any]] = []
-    bms = event.get("bookmakers", [])
-    fair_home, fair_away = two_way_fair_probs(bms, "h2h", event.get("home_team"), event.get("away_team"))
-    best = _best_prices_two_way(bms, allowed_books=price_books)
+# ---------- packed builders ----------
 
-    for sel_key, info in best.items():
-        market_key, name = sel_key.split("::", 1)
-        if market_key != "h2h":
-            continue
+def _straight_picks(packed, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    event_id, sport_key, commence_time, home, away, markets = packed
+    picks = []
+    fair_home, fair_away = _two_way_fair_probs(markets, "h2h", home, away)
+    best = _best_prices_two_way(markets, allowed_books=price_books)
+
+    for name, info in best.items():
         price = info["price"]
         dec = american_to_decimal(price)
-        if name in ("home", event.get("home_team")):
+        if name in ("home", home):
             fair = fair_home
-            sel_name = event.get("home_team")
-        elif name in ("away", event.get("away_team")):
+            sel_name = home
+        elif name in ("away", away):
             fair = fair_away
-            sel_name = event.get("away_team")
+            sel_name = away
         else:
             continue
         if not (0 < fair < 1):
@@ -120,9 +148,9 @@ def build_straight_picks(event: Dict[str, Any], kelly_fraction: float, bankroll_
         ev = expected_value_per_unit(model, dec)
         stake = kelly_stake_units(model, dec, kelly_fraction, bankroll_units)
         picks.append({
-            "event_id": event.get("id"),
-            "sport_key": event.get("sport_key"),
-            "commence_time": event.get("commence_time"),
+            "event_id": event_id,
+            "sport_key": sport_key,
+            "commence_time": commence_time,
             "market": "moneyline",
             "selection": sel_name,
             "book": info["book"],
@@ -138,39 +166,13 @@ def build_straight_picks(event: Dict[str, Any], kelly_fraction: float, bankroll_
         })
     return sorted(picks, key=lambda x: (-x["ev_per_unit"], -x["stake_units"]))
 
-def two_way_fair_probs(bookmakers: List[Dict[str, Any]], market_key: str, side_a: str, side_b: str) -> Tuple[float, float]:
-    raw_a, raw_b, n = 0.0, 0.0, 0
-    alias = _aliases(side_a, side_b)
-    for bm in bookmakers:
-        for m in bm.get("markets", []):
-            if m.get("key") != market_key:
-                continue
-            outcomes = {}
-            for o in m.get("outcomes", []):
-                nm = o.get("name")
-                if nm is None:
-                    continue
-                nm = alias.get(nm, nm)
-                outcomes[nm] = o
-            if side_a in outcomes and side_b in outcomes:
-                pa = american_to_prob(outcomes[side_a]["price"])
-                pb = american_to_prob(outcomes[side_b]["price"])
-                raw_a += pa
-                raw_b += pb
-                n += 1
-    if n == 0:
-        return 0.0, 0.0
-    pa, pb = raw_a / n, raw_b / n
-    return no_vig_two_way(pa, pb)
-
-def build_spread_picks(event, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+def _spread_picks(packed, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    event_id, sport_key, commence_time, home, away, markets = packed
     picks = []
-    bms = event.get("bookmakers", [])
-    home, away = event.get("home_team"), event.get("away_team")
     alias = _aliases(home, away)
 
-    buckets = _collect_two_way_by_point(bms, "spreads", home, away)
-    best = _best_prices_two_way_with_point(bms, "spreads", allowed_books=price_books, side_alias=alias)
+    buckets = _collect_two_way_by_point(markets, "spreads", home, away)
+    best = _best_prices_two_way_with_point(markets, "spreads", allowed_books=price_books, side_alias=alias)
 
     for pt, (sum_a, sum_b, n) in buckets.items():
         if n == 0:
@@ -188,9 +190,9 @@ def build_spread_picks(event, kelly_fraction, bankroll_units, edge_A, edge_B, pr
             ev = expected_value_per_unit(model, dec)
             stake = kelly_stake_units(model, dec, kelly_fraction, bankroll_units)
             picks.append({
-                "event_id": event.get("id"),
-                "sport_key": event.get("sport_key"),
-                "commence_time": event.get("commence_time"),
+                "event_id": event_id,
+                "sport_key": sport_key,
+                "commence_time": commence_time,
                 "market": f"spread {pt:+}",
                 "selection": f"{name} {pt:+}",
                 "book": info["book"],
@@ -206,11 +208,11 @@ def build_spread_picks(event, kelly_fraction, bankroll_units, edge_A, edge_B, pr
             })
     return sorted(picks, key=lambda x: (-x["ev_per_unit"], -x["stake_units"]))
 
-def build_total_picks(event, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+def _total_picks(packed, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    event_id, sport_key, commence_time, _home, _away, markets = packed
     picks = []
-    bms = event.get("bookmakers", [])
-    buckets = _collect_two_way_by_point(bms, "totals", "Over", "Under")
-    best = _best_prices_two_way_with_point(bms, "totals", allowed_books=price_books)
+    buckets = _collect_two_way_by_point(markets, "totals", "Over", "Under")
+    best = _best_prices_two_way_with_point(markets, "totals", allowed_books=price_books)
 
     for pt, (sum_o, sum_u, n) in buckets.items():
         if n == 0:
@@ -228,9 +230,9 @@ def build_total_picks(event, kelly_fraction, bankroll_units, edge_A, edge_B, pri
             ev = expected_value_per_unit(model, dec)
             stake = kelly_stake_units(model, dec, kelly_fraction, bankroll_units)
             picks.append({
-                "event_id": event.get("id"),
-                "sport_key": event.get("sport_key"),
-                "commence_time": event.get("commence_time"),
+                "event_id": event_id,
+                "sport_key": sport_key,
+                "commence_time": commence_time,
                 "market": f"total {pt}",
                 "selection": f"{name} {pt}",
                 "book": info["book"],
@@ -246,12 +248,12 @@ def build_total_picks(event, kelly_fraction, bankroll_units, edge_A, edge_B, pri
             })
     return sorted(picks, key=lambda x: (-x["ev_per_unit"], -x["stake_units"]))
 
-def build_prop_picks(event, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+def _prop_picks(packed, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    event_id, sport_key, commence_time, _home, _away, markets = packed
     picks = []
-    bms = event.get("bookmakers", [])
     for mkey in prop_market_keys:
-        buckets = _collect_two_way_by_point(bms, mkey, "Over", "Under")
-        best = _best_prices_two_way_with_point(bms, mkey, allowed_books=price_books)
+        buckets = _collect_two_way_by_point(markets, mkey, "Over", "Under")
+        best = _best_prices_two_way_with_point(markets, mkey, allowed_books=price_books)
         for pt, (sum_o, sum_u, n) in buckets.items():
             if n == 0:
                 continue
@@ -268,9 +270,9 @@ def build_prop_picks(event, prop_market_keys, kelly_fraction, bankroll_units, ed
                 ev = expected_value_per_unit(model, dec)
                 stake = kelly_stake_units(model, dec, kelly_fraction, bankroll_units)
                 picks.append({
-                    "event_id": event.get("id"),
-                    "sport_key": event.get("sport_key"),
-                    "commence_time": event.get("commence_time"),
+                    "event_id": event_id,
+                    "sport_key": sport_key,
+                    "commence_time": commence_time,
                     "market": f"{mkey} {pt}",
                     "selection": f"{name} {pt}",
                     "book": info["book"],
@@ -286,6 +288,39 @@ def build_prop_picks(event, prop_market_keys, kelly_fraction, bankroll_units, ed
                 })
     return sorted(picks, key=lambda x: (-x["ev_per_unit"], -x["stake_units"]))
 
+def build_packed_event_picks(packed, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    """All straight/spread/total/prop picks for one packed event, in display order."""
+    picks = []
+    picks += _straight_picks(packed, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+    picks += _spread_picks(packed, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+    picks += _total_picks(packed, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+    if prop_market_keys:
+        picks += _prop_picks(packed, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+    return picks
+
+# ---------- builders ----------
+
+def build_straight_picks(event: Dict[str, Any], kelly_fraction: float, bankroll_units: float,
+                         edge_A: float, edge_B: float, price_books: List[str] | None = None) -> List[Dict[str, Any]]:
+    return _straight_picks(pack_event(event), kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+
+def two_way_fair_probs(bookmakers: List[Dict[str, Any]], market_key: str, side_a: str, side_b: str) -> Tuple[float, float]:
+    markets = pack_event({"bookmakers": bookmakers}, [market_key])[-1]
+    return _two_way_fair_probs(markets, market_key, side_a, side_b)
+
+def build_spread_picks(event, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    return _spread_picks(pack_event(event), kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+
+def build_total_picks(event, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    return _total_picks(pack_event(event), kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+
+def build_prop_picks(event, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    return _prop_picks(pack_event(event, prop_market_keys), prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+
+def build_event_picks(event, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    """All straight/spread/total/prop picks for one event, in display order."""
+    return build_packed_event_picks(pack_event(event, prop_market_keys), prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+
 def build_parlays(picks: List[Dict[str, Any]], conservative_legs: int = 2, balanced_legs: int = 3, fun_max_legs: int = 4) -> List[Dict[str, Any]]:
     by_event = {}
     for p in picks:
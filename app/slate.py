@@ -0,0 +1,183 @@
+from __future__ import annotations
+import gc
+import marshal
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Dict, List, Set, Tuple
+
+from reasoning import explain_pick
+from selection import build_event_picks, build_packed_event_picks, pack_event
+
+# Slates smaller than this run in-process: a day's multi-sport slate builds in
+# well under 100ms on one core, less than a single round trip through a cold
+# pool. Chunks are kept large enough that per-chunk IPC (~1ms) stays noise.
+# See benchmarks/bench_slate.py for the numbers behind both.
+PARALLEL_MIN_EVENTS = 500
+MIN_EVENTS_PER_CHUNK = 64
+CHUNKS_PER_WORKER = 4
+
+# ---------- helpers ----------
+
+def default_workers() -> int:
+    """CPUs this process may actually run on (respects affinity/container limits)."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def make_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn, not fork: the caller is a Streamlit script thread and forking it
+    # while the server threads hold locks can deadlock the children. Spawned
+    # children re-import the launching script as __mp_main__, so the app keeps
+    # its top-level code behind a __main__ guard; they get the parent's
+    # sys.path, so sibling modules stay importable.
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+@contextmanager
+def _gc_paused():
+    # Packing and marshal round trips allocate hundreds of thousands of small
+    # acyclic containers; letting the cyclic GC rescan them costs more than
+    # the builders themselves.
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def _usable(event: Dict[str, Any]) -> bool:
+    return bool(event.get("bookmakers") and event.get("home_team") and event.get("away_team"))
+
+def _detect_markets(event: Dict[str, Any], detected: Set[str]) -> None:
+    # collect which market keys actually came back (for debugging/visibility)
+    for bm in event.get("bookmakers", []):
+        for m in bm.get("markets", []):
+            if m.get("key"):
+                detected.add(m["key"])
+
+def _with_explanations(picks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    for p in picks:
+        p["explanation"] = explain_pick(p)
+    return picks
+
+def _pack_chunk(events: List[Dict[str, Any]], prop_market_keys: List[str], detected: Set[str]) -> bytes:
+    """Marshal the usable events of a chunk in selection's compact form.
+
+    The compact form drops markets the builders don't read, so the full set of
+    market keys is recorded into `detected` here rather than in the worker.
+    """
+    packed = []
+    with _gc_paused():
+        for ev in events:
+            if not _usable(ev):
+                continue
+            _detect_markets(ev, detected)
+            packed.append(pack_event(ev, prop_market_keys))
+        return marshal.dumps(packed)
+
+def _evaluate_chunk(blob: bytes, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None) -> bytes:
+    """Worker entry point: marshalled packed events in, marshalled picks out."""
+    picks = []
+    with _gc_paused():
+        for packed in marshal.loads(blob):
+            picks.extend(_with_explanations(build_packed_event_picks(
+                packed, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books
+            )))
+        return marshal.dumps(picks)
+
+def _chunk_bounds(n_events: int, workers: int) -> List[Tuple[int, int]]:
+    n_chunks = min(workers * CHUNKS_PER_WORKER, n_events // MIN_EVENTS_PER_CHUNK)
+    if n_chunks <= 1:
+        return [(0, n_events)]
+    size, extra = divmod(n_events, n_chunks)
+    bounds, start = [], 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < extra else 0)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+# ---------- evaluation ----------
+
+def _evaluate_serial(events, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=None):
+    picks: List[Dict[str, Any]] = []
+    detected: Set[str] = set()
+    with _gc_paused():
+        for ev in events:
+            if not _usable(ev):
+                continue
+            _detect_markets(ev, detected)
+            picks.extend(_with_explanations(build_event_picks(
+                ev, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books
+            )))
+    return picks, detected
+
+def _evaluate_parallel(pool, workers, bounds, events, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B,
+                       price_books=None):
+    run = partial(
+        _evaluate_chunk,
+        prop_market_keys=prop_market_keys,
+        kelly_fraction=kelly_fraction,
+        bankroll_units=bankroll_units,
+        edge_A=edge_A,
+        edge_B=edge_B,
+        price_books=price_books,
+    )
+    detected: Set[str] = set()
+    results: List[Any] = [None] * len(bounds)
+    in_flight: Dict[Any, int] = {}
+
+    def _collect(done):
+        for fut in done:
+            i = in_flight.pop(fut)
+            with _gc_paused():
+                results[i] = marshal.loads(fut.result())
+
+    # At most `workers` chunks are in flight, so a shared pool sized to every
+    # CPU still honours the requested count. Each chunk is packed just before
+    # it is submitted, so workers start while the rest is still being packed.
+    try:
+        for i, (start, end) in enumerate(bounds):
+            if len(in_flight) >= workers:
+                _collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+            blob = _pack_chunk(events[start:end], prop_market_keys, detected)
+            in_flight[pool.submit(run, blob)] = i
+        while in_flight:
+            _collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+    except BaseException:
+        # don't leave queued chunks holding a long-lived pool for the next run
+        for fut in in_flight:
+            fut.cancel()
+        raise
+
+    picks: List[Dict[str, Any]] = []
+    for chunk_picks in results:  # chunk order, so the merge matches the serial path
+        picks.extend(chunk_picks)
+    return picks, detected
+
+def evaluate_slate(events: List[Dict[str, Any]], prop_market_keys: List[str], kelly_fraction: float, bankroll_units: float,
+                   edge_A: float, edge_B: float, price_books: List[str] | None = None,
+                   workers: int = 1, pool: Executor | None = None) -> Tuple[List[Dict[str, Any]], Set[str]]:
+    """Build picks for every usable event in the slate.
+
+    Returns (picks, detected market keys). With workers > 1 and a slate of at
+    least PARALLEL_MIN_EVENTS events, contiguous chunks are evaluated in `pool`
+    (or a throwaway pool from make_pool when none is given), at most `workers`
+    at a time; picks come back in the same order as the serial path. A worker
+    crash surfaces as concurrent.futures.process.BrokenProcessPool.
+    """
+    prop_market_keys = list(prop_market_keys or [])
+    bounds = _chunk_bounds(len(events), workers) if workers > 1 and len(events) >= PARALLEL_MIN_EVENTS else []
+    if len(bounds) <= 1:
+        return _evaluate_serial(events, prop_market_keys, kelly_fraction, bankroll_units, edge_A, edge_B, price_books=price_books)
+
+    if pool is None:
+        with make_pool(workers) as own_pool:
+            return _evaluate_parallel(own_pool, workers, bounds, events, prop_market_keys, kelly_fraction, bankroll_units,
+                                      edge_A, edge_B, price_books=price_books)
+    return _evaluate_parallel(pool, workers, bounds, events, prop_market_keys, kelly_fraction, bankroll_units,
+                              edge_A, edge_B, price_books=price_books)
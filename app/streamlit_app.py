@@ -1,5 +1,6 @@
 from __future__ import annotations
 import os, sys, datetime as dt
+from concurrent.futures.process import BrokenProcessPool
 import pytz
 import pandas as pd
 import streamlit as st
@@ -9,158 +10,159 @@ CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 if CURRENT_DIR not in sys.path:
     sys.path.append(CURRENT_DIR)
 
-from config import KELLY_FRACTION, EDGE_A, EDGE_B, PARLAY_MAX_LEGS
+from config import KELLY_FRACTION, EDGE_A, EDGE_B, PARLAY_MAX_LEGS, WORKERS
 from odds_api import fetch_odds_for_sport, fetch_sports
-from selection import (
-    build_straight_picks,
-    build_spread_picks,
-    build_total_picks,
-    build_prop_picks,
-    build_parlays,
-    find_near_misses,
-)
-from reasoning import explain_pick
+from selection import build_parlays, find_near_misses
+from slate import evaluate_slate, default_workers, make_pool
 
 
-st.set_page_config(page_title="Fliff Picks Copilot", page_icon="🎯", layout="wide")
-st.title("🎯 Fliff Picks Copilot — v2 (Cloud)")
+@st.cache_resource
+def _worker_pool():
+    # One long-lived pool for the server, sized to the CPUs we may use; the
+    # "Worker processes" input only caps how many chunks run at once.
+    return make_pool(default_workers())
 
-today = dt.date.today()
-st.caption(f"Today: {today.isoformat()} — Fair probs from full market; pricing uses best line from any book.")
 
-# Dynamic sports list from provider
-with st.spinner("Loading sports…"):
+def _build_picks(slate, prop_keys, kelly_fraction, bankroll_units, workers):
+    if workers <= 1:
+        return evaluate_slate(slate, prop_keys, kelly_fraction, bankroll_units, EDGE_A, EDGE_B, price_books=None)
+    pool = _worker_pool()
     try:
-        sport_list = fetch_sports()
-        all_options = [s.get("key") for s in sport_list if s.get("key")]
-    except Exception as e:
-        st.error(f"Could not load sports: {e}")
-        all_options = []
-
-sports = st.multiselect("Sports", options=all_options, default=all_options)
+        return evaluate_slate(
+            slate, prop_keys, kelly_fraction, bankroll_units, EDGE_A, EDGE_B,
+            price_books=None, workers=workers, pool=pool,
+        )
+    except BrokenProcessPool:
+        # a worker died (e.g. OOM); drop the dead pool so the next run starts a fresh one
+        pool.shutdown(wait=False, cancel_futures=True)
+        _worker_pool.clear()
+        st.warning("A worker process crashed; built this slate on a single core instead.")
+        return evaluate_slate(slate, prop_keys, kelly_fraction, bankroll_units, EDGE_A, EDGE_B, price_books=None)
 
-bankroll_units = st.number_input("Bankroll (units)", min_value=10, max_value=10000, value=100, step=10)
-kelly_fraction = st.slider("Kelly fraction", 0.0, 1.0, float(KELLY_FRACTION), 0.05)
 
-colA, colB = st.columns([1, 1])
-fetch_clicked = colA.button("Fetch today’s slate & build picks")
-refresh_clicked = colB.button("Refresh odds")
+# Streamlit runs this script as __main__; spawned pool workers re-import it as
+# __mp_main__ and must not rebuild the page or call the odds API.
+def main():
+    st.set_page_config(page_title="Fliff Picks Copilot", page_icon="🎯", layout="wide")
+    st.title("🎯 Fliff Picks Copilot — v2 (Cloud)")
 
-if fetch_clicked or refresh_clicked:
-    all_picks = []
-    detected_markets = set()
+    today = dt.date.today()
+    st.caption(f"Today: {today.isoformat()} — Fair probs from full market; pricing uses best line from any book.")
 
-    for sk in sports:
-        with st.spinner(f"Fetching odds for {sk}…"):
-            try:
-                events = fetch_odds_for_sport(sk)  # markets come from Secrets->MARKETS
-            except Exception as e:
-                st.error(f"Failed to fetch {sk}: {e}")
-                continue
-
-            for ev in events:
-                if not ev.get("bookmakers") or not ev.get("home_team") or not ev.get("away_team"):
-                    continue
-
-                # collect which market keys actually came back (for debugging/visibility)
-                for bm in ev.get("bookmakers", []):
-                    for m in bm.get("markets", []):
-                        if m.get("key"):
-                            detected_markets.add(m["key"])
-
-                # Build picks across markets — BEST PRICE FROM ANY BOOK
-                picks = []
-                picks += build_straight_picks(
-                    ev, kelly_fraction, bankroll_units, EDGE_A, EDGE_B, price_books=None
-                )
-                picks += build_spread_picks(
-                    ev, kelly_fraction, bankroll_units, EDGE_A, EDGE_B, price_books=None
-                )
-                picks += build_total_picks(
-                    ev, kelly_fraction, bankroll_units, EDGE_A, EDGE_B, price_books=None
-                )
-                # Props: pull keys that start with player_
-                prop_keys = [
-                    k.strip()
-                    for k in (st.secrets.get("MARKETS", "") or "").split(",")
-                    if k.strip().startswith("player_")
-                ]
-                if prop_keys:
-                    picks += build_prop_picks(
-                        ev, prop_keys, kelly_fraction, bankroll_units, EDGE_A, EDGE_B, price_books=None
-                    )
-
-                for p in picks:
-                    p["explanation"] = explain_pick(p)
-                all_picks.extend(picks)
-
-    if not all_picks:
-        st.warning("No picks generated — try different sports or confirm your API key/books/markets in app secrets.")
-    else:
-        df = pd.DataFrame(all_picks)
-
-        # Convert commence_time to America/New_York
+    # Dynamic sports list from provider
+    with st.spinner("Loading sports…"):
         try:
-            df["commence_time"] = (
-                pd.to_datetime(df["commence_time"], utc=True)
-                .dt.tz_convert("America/New_York")
-                .dt.strftime("%Y-%m-%d %I:%M %p ET")
-            )
-        except Exception:
-            pass
-
-        cols = [
-            "sport_key",
-            "commence_time",
-            "market",
-            "selection",
-            "book",
-            "odds",
-            "decimal",
-            "fair_prob",
-            "model_prob",
-            "edge_pct",
-            "ev_per_unit",
-            "stake_units",
-            "confidence",
+            sport_list = fetch_sports()
+            all_options = [s.get("key") for s in sport_list if s.get("key")]
+        except Exception as e:
+            st.error(f"Could not load sports: {e}")
+            all_options = []
+
+    sports = st.multiselect("Sports", options=all_options, default=all_options)
+
+    bankroll_units = st.number_input("Bankroll (units)", min_value=10, max_value=10000, value=100, step=10)
+    kelly_fraction = st.slider("Kelly fraction", 0.0, 1.0, float(KELLY_FRACTION), 0.05)
+    max_workers = default_workers()
+    workers = st.number_input(
+        "Worker processes (1 = single-core)", min_value=1, max_value=max_workers,
+        value=max(1, min(WORKERS, max_workers)), step=1,
+    )
+
+    colA, colB = st.columns([1, 1])
+    fetch_clicked = colA.button("Fetch today’s slate & build picks")
+    refresh_clicked = colB.button("Refresh odds")
+
+    if fetch_clicked or refresh_clicked:
+        # Props: pull keys that start with player_
+        prop_keys = [
+            k.strip()
+            for k in (st.secrets.get("MARKETS", "") or "").split(",")
+            if k.strip().startswith("player_")
         ]
-        st.subheader("Top straight picks")
-        st.dataframe(
-            df[cols].sort_values(["ev_per_unit", "stake_units"], ascending=False),
-            use_container_width=True,
-        )
 
-        st.subheader("Parlay ideas")
-        parlays = build_parlays(all_picks, conservative_legs=2, balanced_legs=3, fun_max_legs=int(PARLAY_MAX_LEGS))
-        if not parlays:
-            st.info("Not enough high-quality legs to form parlays today.")
+        slate = []
+        for sk in sports:
+            with st.spinner(f"Fetching odds for {sk}…"):
+                try:
+                    slate.extend(fetch_odds_for_sport(sk))  # markets come from Secrets->MARKETS
+                except Exception as e:
+                    st.error(f"Failed to fetch {sk}: {e}")
+
+        # Build picks across markets — BEST PRICE FROM ANY BOOK
+        with st.spinner(f"Building picks for {len(slate)} events…"):
+            all_picks, detected_markets = _build_picks(slate, prop_keys, kelly_fraction, bankroll_units, int(workers))
+
+        if not all_picks:
+            st.warning("No picks generated — try different sports or confirm your API key/books/markets in app secrets.")
         else:
-            for par in parlays:
-                st.markdown(
-                    f"**{par['name']}** — Combined Dec Odds: `{par['combined_decimal']}` "
-                    f"| Est. Hit Prob: `{par['est_hit_prob']}` | Est. EV: `{par['est_ev']}`"
+            df = pd.DataFrame(all_picks)
+
+            # Convert commence_time to America/New_York
+            try:
+                df["commence_time"] = (
+                    pd.to_datetime(df["commence_time"], utc=True)
+                    .dt.tz_convert("America/New_York")
+                    .dt.strftime("%Y-%m-%d %I:%M %p ET")
                 )
-                for leg in par["legs"]:
-                    st.write(f"• {leg['selection']} @ {leg['odds']} ({leg['book']})")
-                st.caption(par["notes"])
-
-        # Near misses for transparency
-        st.subheader("Near misses (just below EV>0)")
-        near = find_near_misses(all_picks, ev_floor=-0.02, ev_ceiling=0.0, limit=12)
-        if near:
+            except Exception:
+                pass
+
+            cols = [
+                "sport_key",
+                "commence_time",
+                "market",
+                "selection",
+                "book",
+                "odds",
+                "decimal",
+                "fair_prob",
+                "model_prob",
+                "edge_pct",
+                "ev_per_unit",
+                "stake_units",
+                "confidence",
+            ]
+            st.subheader("Top straight picks")
             st.dataframe(
-                pd.DataFrame(near)[
-                    ["sport_key", "commence_time", "selection", "book", "odds", "ev_per_unit"]
-                ],
+                df[cols].sort_values(["ev_per_unit", "stake_units"], ascending=False),
                 use_container_width=True,
             )
-        else:
-            st.caption("None today.")
 
-        # Detected markets (so you can tune MARKETS in Secrets)
-        if detected_markets:
-            with st.expander("See detected market keys today"):
-                st.write(sorted(list(detected_markets)))
+            st.subheader("Parlay ideas")
+            parlays = build_parlays(all_picks, conservative_legs=2, balanced_legs=3, fun_max_legs=int(PARLAY_MAX_LEGS))
+            if not parlays:
+                st.info("Not enough high-quality legs to form parlays today.")
+            else:
+                for par in parlays:
+                    st.markdown(
+                        f"**{par['name']}** — Combined Dec Odds: `{par['combined_decimal']}` "
+                        f"| Est. Hit Prob: `{par['est_hit_prob']}` | Est. EV: `{par['est_ev']}`"
+                    )
+                    for leg in par["legs"]:
+                        st.write(f"• {leg['selection']} @ {leg['odds']} ({leg['book']})")
+                    st.caption(par["notes"])
+
+            # Near misses for transparency
+            st.subheader("Near misses (just below EV>0)")
+            near = find_near_misses(all_picks, ev_floor=-0.02, ev_ceiling=0.0, limit=12)
+            if near:
+                st.dataframe(
+                    pd.DataFrame(near)[
+                        ["sport_key", "commence_time", "selection", "book", "odds", "ev_per_unit"]
+                    ],
+                    use_container_width=True,
+                )
+            else:
+                st.caption("None today.")
+
+            # Detected markets (so you can tune MARKETS in Secrets)
+            if detected_markets:
+                with st.expander("See detected market keys today"):
+                    st.write(sorted(list(detected_markets)))
+
+    st.divider()
+    st.caption("For informational/educational use. Play responsibly.")
+
 
-st.divider()
-st.caption("For informational/educational use. Play responsibly.")
+if __name__ == "__main__":
+    main()
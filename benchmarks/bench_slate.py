@@ -0,0 +1,116 @@
+"""Serial vs multi-process slate evaluation on a synthetic slate.
+
+    python benchmarks/bench_slate.py --events 3000 --books 6
+
+Prints the serial time, the parent's share of the parallel path (packing and
+marshalling chunks, which cannot overlap with itself), the workers' total
+share (unmarshal + builders), and wall time for 1..N workers on a warm pool.
+The ceiling on speedup is serial / max(parent, workers_total / N); the
+parent share is what keeps it from being exactly linear.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import slate
+from slate import _chunk_bounds, _evaluate_chunk, _pack_chunk, default_workers, evaluate_slate, make_pool
+
+PROPS = ["player_points", "player_assists", "player_rebounds"]
+ARGS = (0.25, 100, 2.5, 1.0)
+
+
+def synthetic_slate(n_events, n_books, seed=1):
+    rng = random.Random(seed)
+    events = []
+    for i in range(n_events):
+        home, away = f"Home {i}", f"Away {i}"
+        bookmakers = []
+        for b in range(n_books):
+            markets = [
+                {"key": "h2h", "outcomes": [
+                    {"name": home, "price": rng.choice([-160, -120, 105, 130])},
+                    {"name": away, "price": rng.choice([-140, 100, 125])},
+                ]},
+                {"key": "spreads", "outcomes": [
+                    {"name": home, "price": -110, "point": -3.5},
+                    {"name": away, "price": rng.choice([-105, -115]), "point": 3.5},
+                ]},
+                {"key": "totals", "outcomes": [
+                    {"name": "Over", "price": rng.choice([-115, -110]), "point": 220.5},
+                    {"name": "Under", "price": rng.choice([-105, -110]), "point": 220.5},
+                ]},
+                {"key": "alternate_spreads", "outcomes": [
+                    {"name": side, "price": rng.choice([-300, 250]), "point": pt}
+                    for pt in (-7.5, -5.5, 5.5, 7.5) for side in (home, away)
+                ]},
+            ]
+            for pk in PROPS:
+                markets.append({"key": pk, "outcomes": [
+                    {"name": side, "description": f"Player {i}-{j}", "price": rng.choice([-125, -110, 100, 110]), "point": pt}
+                    for j in range(2) for pt in (10.5, 20.5) for side in ("Over", "Under")
+                ]})
+            bookmakers.append({"key": f"book{b}", "last_update": "2026-10-19T12:00:00Z", "markets": markets})
+        events.append({
+            "id": f"ev{i}", "sport_key": "basketball_nba", "commence_time": "2026-10-19T23:00:00Z",
+            "home_team": home, "away_team": away, "bookmakers": bookmakers,
+        })
+    return events
+
+
+def _best_of(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t
+        best = dt if best is None or dt < best else best
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--events", type=int, default=3000)
+    ap.add_argument("--books", type=int, default=6)
+    ap.add_argument("--workers", type=int, default=default_workers())
+    args = ap.parse_args()
+
+    events = synthetic_slate(args.events, args.books)
+    print(f"{len(events)} events x {args.books} books, {len(PROPS)} prop markets, {default_workers()} usable CPUs")
+
+    serial_s, serial = _best_of(lambda: evaluate_slate(events, PROPS, *ARGS))
+    print(f"serial                 {serial_s:7.3f}s  ({serial_s / len(events) * 1e3:.3f} ms/event)")
+
+    bounds = _chunk_bounds(len(events), max(args.workers, 2))
+    parent_s, blobs = _best_of(lambda: [_pack_chunk(events[a:b], PROPS, set()) for a, b in bounds])
+    worker_s, _ = _best_of(lambda: [_evaluate_chunk(blob, PROPS, *ARGS) for blob in blobs])
+    print(f"parent pack+marshal    {parent_s:7.3f}s  ({parent_s / serial_s:.0%} of serial)")
+    print(f"workers total          {worker_s:7.3f}s  ({worker_s / serial_s:.0%} of serial)")
+
+    with make_pool(args.workers) as pool:
+        # warm every worker so spawn start-up isn't billed to the first run
+        t = time.perf_counter()
+        list(pool.map(abs, range(args.workers * 4)))
+        print(f"pool start-up          {time.perf_counter() - t:7.3f}s  (once per server, pool is long-lived)")
+        tiny = _pack_chunk(events[:1], PROPS, set())
+        rt_s, _ = _best_of(lambda: pool.submit(_evaluate_chunk, tiny, PROPS, *ARGS).result(), repeat=20)
+        print(f"1-event round trip     {rt_s * 1e3:7.3f}ms")
+
+        for n in sorted({1, 2, 4, 8, args.workers}):
+            if n > args.workers:
+                continue
+            if n == 1:
+                wall = serial_s
+            else:
+                wall, out = _best_of(lambda: evaluate_slate(events, PROPS, *ARGS, workers=n, pool=pool))
+                assert out == serial, "parallel picks diverged from serial"
+            bound = serial_s / max(parent_s, worker_s / n)
+            print(f"workers={n:<3d} wall {wall:7.3f}s  speedup {serial_s / wall:5.2f}x  (ceiling {bound:5.2f}x)")
+    print(f"PARALLEL_MIN_EVENTS={slate.PARALLEL_MIN_EVENTS} MIN_EVENTS_PER_CHUNK={slate.MIN_EVENTS_PER_CHUNK}")
+
+
+if __name__ == "__main__":
+    main()
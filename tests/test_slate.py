@@ -0,0 +1,198 @@
+import ast
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+# app modules import each other as siblings (see streamlit_app.py)
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+
+import slate
+from selection import pack_event
+from slate import _chunk_bounds, default_workers, evaluate_slate, make_pool
+
+PROPS = ["player_points", "player_assists"]
+ARGS = (0.25, 100, 2.5, 1.0)
+
+
+def _event(rng, i):
+    home, away = f"Home {i}", f"Away {i}"
+    bookmakers = []
+    for b in range(4):
+        markets = [
+            {"key": "h2h", "outcomes": [
+                {"name": home, "price": rng.choice([-160, -120, 105, 130])},
+                {"name": away, "price": rng.choice([-140, 100, 125])},
+            ]},
+            {"key": "spreads", "outcomes": [
+                {"name": home, "price": -110, "point": -3.5},
+                {"name": away, "price": rng.choice([-105, -115]), "point": 3.5},
+            ]},
+            {"key": "totals", "outcomes": [
+                {"name": "Over", "price": rng.choice([-115, -110]), "point": 220.5},
+                {"name": "Under", "price": rng.choice([-105, -110]), "point": 220.5},
+            ]},
+            {"key": "alternate_spreads", "outcomes": [
+                {"name": home, "price": 250, "point": -7.5},
+                {"name": away, "price": -300, "point": 7.5},
+            ]},
+        ]
+        for pk in PROPS:
+            outcomes = []
+            for pt in (10.5, 20.5):
+                for side in ("Over", "Under"):
+                    outcomes.append({
+                        "name": side, "description": f"Player {i}",
+                        "price": rng.choice([-125, -110, 100, 110]), "point": pt,
+                    })
+            markets.append({"key": pk, "outcomes": outcomes})
+        bookmakers.append({"key": f"book{b}", "title": f"Book {b}", "markets": markets})
+    return {
+        "id": f"ev{i}",
+        "sport_key": "basketball_nba",
+        "commence_time": "2026-10-19T23:00:00Z",
+        "home_team": home,
+        "away_team": away,
+        "bookmakers": bookmakers,
+    }
+
+
+def _slate(n=200):
+    rng = random.Random(7)
+    events = [_event(rng, i) for i in range(n)]
+    # events the app skips must be skipped identically in every chunk
+    events.insert(5, {"id": "no-books", "home_team": "A", "away_team": "B", "bookmakers": []})
+    events.insert(120, {"id": "no-teams", "bookmakers": events[0]["bookmakers"]})
+    return events
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # keep the test slates small but still split across several chunks
+    monkeypatch.setattr(slate, "PARALLEL_MIN_EVENTS", 32)
+    monkeypatch.setattr(slate, "MIN_EVENTS_PER_CHUNK", 8)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with make_pool(2) as p:
+        yield p
+
+
+class _RecordingPool(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        fut = super().submit(fn, *args, **kwargs)
+        self.submitted.append(fut)
+        return fut
+
+
+def test_parallel_matches_serial(small_chunks, pool):
+    events = _slate()
+    for price_books in (None, ["book1", "book3"]):
+        serial = evaluate_slate(events, PROPS, *ARGS, price_books=price_books)
+        assert serial[0]
+        assert "alternate_spreads" in serial[1]
+        for _ in range(2):  # the pool is long-lived; reuse must not change results
+            assert evaluate_slate(events, PROPS, *ARGS, price_books=price_books, workers=2, pool=pool) == serial
+
+
+def test_compact_form_keeps_only_what_builders_read():
+    event = _slate(1)[0]
+    event_id, sport_key, commence_time, home, away, markets = pack_event(event, PROPS)
+    assert (event_id, home, away) == ("ev0", "Home 0", "Away 0")
+    assert sorted(markets) == sorted(["h2h", "spreads", "totals"] + PROPS)
+    book_key, outcomes = markets["player_points"][0]
+    assert book_key == "book0"
+    assert all(len(o) == 3 for o in outcomes)  # name, price, point; no description
+
+
+def test_small_slate_stays_in_process():
+    events = _slate(10)
+    assert len(events) < slate.PARALLEL_MIN_EVENTS
+    recorder = _RecordingPool()
+    with recorder:
+        out = evaluate_slate(events, PROPS, *ARGS, workers=8, pool=recorder)
+    assert not recorder.submitted
+    assert out == evaluate_slate(events, PROPS, *ARGS)
+
+
+def test_chunk_bounds_are_contiguous():
+    bounds = _chunk_bounds(1003, 4)
+    assert len(bounds) == 15
+    assert bounds[0][0] == 0 and bounds[-1][1] == 1003
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+
+
+def test_failing_chunk_cancels_the_rest(small_chunks):
+    events = _slate()
+    # a malformed price makes the best-price comparison raise inside the first chunk
+    events[0]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] = "n/a"
+    recorder = _RecordingPool()
+    with recorder:
+        with pytest.raises(TypeError):
+            evaluate_slate(events, PROPS, *ARGS, workers=2, pool=recorder)
+        assert len(recorder.submitted) < len(_chunk_bounds(len(events), 2))
+        assert all(f.done() for f in recorder.submitted)
+
+
+def test_failing_chunk_leaves_pool_usable(small_chunks, pool):
+    events = _slate()
+    bad = [dict(ev) for ev in events]
+    bad[0] = _slate(1)[0]
+    bad[0]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] = "n/a"
+    with pytest.raises(TypeError):
+        evaluate_slate(bad, PROPS, *ARGS, workers=2, pool=pool)
+    assert evaluate_slate(events, PROPS, *ARGS, workers=2, pool=pool) == evaluate_slate(events, PROPS, *ARGS)
+
+
+def test_worker_crash_surfaces_as_broken_pool(small_chunks):
+    events = _slate()
+    with make_pool(2) as doomed:
+        doomed.submit(abs, 1).result()
+        for proc in list(doomed._processes.values()):
+            proc.kill()
+            proc.join()
+        with pytest.raises(BrokenProcessPool):
+            evaluate_slate(events, PROPS, *ARGS, workers=2, pool=doomed)
+
+
+def test_app_script_is_safe_to_reimport():
+    # spawned workers re-import streamlit_app.py as __mp_main__; everything
+    # that draws the page or calls the odds API must sit behind the guard
+    with open(os.path.join(APP_DIR, "streamlit_app.py"), encoding="utf-8") as fh:
+        tree = ast.parse(fh.read())
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            continue
+        if isinstance(node, ast.If) and "__name__" in ast.unparse(node.test):
+            continue
+        names = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+        assert not names & {"st", "fetch_sports", "fetch_odds_for_sport", "main"}, ast.unparse(node)
+
+
+@pytest.mark.skipif(default_workers() < 4, reason="needs at least 4 CPUs")
+def test_parallel_scales_with_cores():
+    sys.path.append(os.path.join(os.path.dirname(APP_DIR), "benchmarks"))
+    from bench_slate import PROPS as BENCH_PROPS, synthetic_slate
+
+    events = synthetic_slate(3000, 6)
+    t = time.perf_counter()
+    serial = evaluate_slate(events, BENCH_PROPS, *ARGS)
+    serial_s = time.perf_counter() - t
+    with make_pool(4) as p:
+        list(p.map(abs, range(16)))  # pay spawn start-up outside the timing
+        t = time.perf_counter()
+        parallel = evaluate_slate(events, BENCH_PROPS, *ARGS, workers=4, pool=p)
+        parallel_s = time.perf_counter() - t
+    assert parallel == serial
+    assert parallel_s < serial_s / 2